@@ -0,0 +1,20 @@
+"""Balance widget helpers.
+
+Kept free of config/logger side effects so they can be imported on their own
+(e.g. by benchmark.py).
+"""
+
+current_money_span = ".free-coins"
+
+
+def parse_money(money_text):
+    """Parse the balance widget text (e.g. "1 234,56\n") into a float."""
+    return float(money_text.replace(",", ".").replace(' ','').replace('\n',''))
+
+
+def get_current_money(page):
+    page.wait_for_selector(current_money_span)
+    return parse_money(page.query_selector(current_money_span).inner_text())
+
+
+__all__ = ["current_money_span", "parse_money", "get_current_money"]
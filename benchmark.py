@@ -0,0 +1,371 @@
+"""Offline benchmarks for the bot's hot paths.
+
+Times the pieces of the betting loop that do not need a browser:
+
+- `record_result` for every strategy class
+- `FileLogger.log_bet` and `SQLiteLedger.log_bet` (rows per second)
+- `get_latest_tickets_iso_date` against tickets logs of growing size
+- `balance.get_current_money` parsing (driven by a fake page object)
+- `plot_strategies.read_balance_trace` on a synthetic multi-million-row CSV
+  (skipped when pandas/matplotlib are not installed)
+
+Each benchmark is looped until one sample takes at least --min-time seconds,
+so tiny benchmarks are not lost in timer noise, and --repeat samples are taken
+round-robin across all benchmarks so the spread reflects noise over the run.
+
+Results are written as JSON so runs can be compared. When --baseline is given
+every benchmark is compared against it and the script exits with 1 if any of
+them got slower than the allowed threshold (beyond the run-to-run spread), or
+if a benchmark from the baseline did not run at all (e.g. read_balance_trace
+without pandas). Benchmarks whose size parameters differ from the baseline
+(--ticket-sizes, --csv-rows) are reported as skipped.
+
+Usage:
+    python benchmark.py                              # run and save logs/benchmark_results.json
+    python benchmark.py --out new.json --baseline old.json --threshold 0.2
+    python benchmark.py --csv-rows 200000            # smaller CSV for a quick run
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from logger import FileLogger, get_latest_tickets_iso_date
+
+
+def _bench(name: str, fn: Callable[[], None], ops: int, params: Dict | None = None) -> Dict:
+    """Describe one benchmark: fn performs `ops` operations per call."""
+    return {"name": name, "fn": fn, "ops": ops, "params": params or {}}
+
+
+def measure(benches: List[Dict], repeat: int, min_time: float) -> List[Dict]:
+    """Time every benchmark and return one result dict per benchmark.
+
+    Each fn is looped until one sample takes at least min_time seconds.
+    Samples are then taken round-robin (one sample of every benchmark per
+    round, `repeat` rounds), so each benchmark's spread also covers machine
+    noise over the whole run rather than one burst. Samples are stored as
+    seconds per op.
+    """
+    loops = []
+    for b in benches:
+        start = time.perf_counter()
+        b["fn"]()
+        first = time.perf_counter() - start
+        loops.append(max(1, int(min_time / first) + 1) if first < min_time else 1)
+
+    samples = [[] for _ in benches]
+    for _ in range(repeat):
+        for i, b in enumerate(benches):
+            start = time.perf_counter()
+            for _ in range(loops[i]):
+                b["fn"]()
+            samples[i].append((time.perf_counter() - start) / (loops[i] * b["ops"]))
+
+    results = []
+    for b, n, per_op in zip(benches, loops, samples):
+        median = statistics.median(per_op)
+        results.append({
+            "name": b["name"],
+            "params": b["params"],
+            "ops": n * b["ops"],
+            "samples": per_op,
+            "median": median,
+            "best": min(per_op),
+            "seconds": median * n * b["ops"],
+            "ops_per_sec": 1 / median if median > 0 else None,
+        })
+    return results
+
+
+def _make_strategies():
+    from strategies.martingale import MartingaleStrategy
+    from strategies.paroli import ParoliStrategy
+    from strategies.fractional import FractionalStrategy
+
+    return {
+        "martingale": lambda: MartingaleStrategy(base_bet=25, multiplier=2),
+        "paroli": lambda: ParoliStrategy(base_bet=25, multiplier=2, target_streak=3),
+        "fractional": lambda: FractionalStrategy(min_bet=25),
+    }
+
+
+def bench_record_result(ops: int) -> List[Dict]:
+    rng = random.Random(0)
+    # pre-generate the outcomes so the RNG is not part of the measurement
+    outcomes = ["win" if rng.random() < 0.475 else "loss" for _ in range(ops)]
+
+    results = []
+    for name, factory in _make_strategies().items():
+        def run(factory=factory):
+            strategy = factory()
+            balance = 10000
+            bet = 25
+            for outcome in outcomes:
+                bet = min(bet, balance) or 25
+                balance = balance + bet if outcome == "win" else balance - bet
+                if balance <= 0:
+                    balance = 100
+                bet = strategy.record_result(outcome, bet, balance)
+
+        results.append(_bench(f"record_result[{name}]", run, ops))
+    return results
+
+
+def bench_log_bet(tmp: Path, ops: int) -> List[Dict]:
+    def run():
+        log_path = tmp / "log_bet.csv"
+        if log_path.exists():
+            log_path.unlink()
+        logger = FileLogger(str(log_path))
+        balance = 1000
+        for i in range(ops):
+            result = "win" if i % 2 else "loss"
+            after = balance + 25 if result == "win" else balance - 25
+            logger.log_bet(25, result, balance_before=balance, balance_after=after)
+            balance = after
+
+    return [_bench("FileLogger.log_bet", run, ops)]
+
+
+def bench_ledger_log_bet(tmp: Path, ops: int) -> List[Dict]:
+    from ledger import SQLiteLedger
+
+    def run():
+        db_path = tmp / "ledger.db"
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        ledger = SQLiteLedger(str(db_path), bot_id="bench", strategy="martingale")
+        balance = 1000
+        for i in range(ops):
+            result = "win" if i % 2 else "loss"
+            after = balance + 25 if result == "win" else balance - 25
+            ledger.log_bet(25, result, balance_before=balance, balance_after=after)
+            balance = after
+        ledger.close()
+
+    return [_bench("SQLiteLedger.log_bet", run, ops)]
+
+
+def _write_tickets_log(path: Path, rows: int) -> None:
+    start = datetime(2024, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FileLogger.DEFAULT_FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({
+                "timestamp": (start + timedelta(hours=i)).isoformat(),
+                "type": "logs/collect_tickets",
+                "bet_value": "",
+                "result": "",
+                "balance_before": "",
+                "balance_after": "",
+                "details": "clicked collect tickets button",
+            })
+
+
+def bench_latest_tickets(tmp: Path, sizes: List[int], calls: int) -> List[Dict]:
+    results = []
+    for rows in sizes:
+        log_path = tmp / f"tickets_{rows}.csv"
+        _write_tickets_log(log_path, rows)
+
+        def run(log_path=log_path):
+            for _ in range(calls):
+                get_latest_tickets_iso_date(str(log_path))
+
+        results.append(_bench("get_latest_tickets_iso_date", run, calls, params={"rows": rows}))
+    return results
+
+
+class _FakeElement:
+    def __init__(self, text: str):
+        self._text = text
+
+    def inner_text(self) -> str:
+        return self._text
+
+
+class _FakePage:
+    """Just enough of a playwright Page for get_current_money."""
+
+    def __init__(self, texts: List[str]):
+        self._elements = [_FakeElement(t) for t in texts]
+        self._i = 0
+
+    def wait_for_selector(self, selector, **kwargs):
+        return self._elements[self._i]
+
+    def query_selector(self, selector):
+        el = self._elements[self._i]
+        self._i = (self._i + 1) % len(self._elements)
+        return el
+
+
+def bench_get_current_money(ops: int) -> List[Dict]:
+    from balance import get_current_money
+
+    page = _FakePage(["1 234,56", "100", "0", "12 345\n", "47,68", "500"])
+
+    def run():
+        for _ in range(ops):
+            get_current_money(page)
+
+    return [_bench("get_current_money", run, ops)]
+
+
+def _write_game_log(path: Path, rows: int) -> None:
+    rng = random.Random(1)
+    start = datetime(2024, 1, 1)
+    balance = 100.0
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(FileLogger.DEFAULT_FIELDS)
+        for i in range(rows):
+            bet = min(25.0, balance)
+            won = rng.random() < 0.475
+            after = balance + bet if won else balance - bet
+            writer.writerow([
+                (start + timedelta(seconds=15 * i)).isoformat(),
+                "bet",
+                bet,
+                "win" if won else "loss",
+                balance,
+                after,
+                "",
+            ])
+            balance = after if after > 0 else 100.0
+
+
+def bench_read_balance_trace(tmp: Path, rows: int) -> List[Dict]:
+    try:
+        from plot_strategies import read_balance_trace
+    except ImportError as exc:
+        print(f"Skipping read_balance_trace: {exc}")
+        return []
+
+    log_path = tmp / "synthetic_game_logs.csv"
+    _write_game_log(log_path, rows)
+    return [_bench("read_balance_trace", lambda: read_balance_trace(log_path), rows, params={"rows": rows})]
+
+
+def run_all(args) -> List[Dict]:
+    benches: List[Dict] = []
+    # the temp files (tickets logs, synthetic CSV) live until every round is done
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        benches += bench_record_result(args.ops)
+        benches += bench_log_bet(tmp, args.log_ops)
+        benches += bench_ledger_log_bet(tmp, args.log_ops)
+        benches += bench_latest_tickets(tmp, args.ticket_sizes, args.ticket_calls)
+        benches += bench_get_current_money(args.ops)
+        benches += bench_read_balance_trace(tmp, args.csv_rows)
+        return measure(benches, args.repeat, args.min_time)
+
+
+def _label(r: Dict) -> str:
+    params = r.get("params") or {}
+    if not params:
+        return r["name"]
+    return f"{r['name']}[{', '.join(f'{k}={v}' for k, v in sorted(params.items()))}]"
+
+
+def _samples(r: Dict) -> List[float]:
+    # results saved before samples were recorded only have seconds/ops
+    return r.get("samples") or [r["seconds"] / r["ops"]]
+
+
+def compare(current: List[Dict], baseline: List[Dict], threshold: float) -> Tuple[List[str], List[str]]:
+    """Compare current results with a baseline.
+
+    Returns (regressions, skipped). A benchmark regressed when both its best
+    and its median time per op are more than `threshold` (0.15 == 15%) above
+    the baseline's AND every current sample is slower than every baseline
+    sample, so differences within the run-to-run spread are not flagged. A baseline benchmark that
+    did not run at all is a regression; one that ran with different size
+    parameters is only reported as skipped.
+    """
+    current_by_key = {_label(r): r for r in current}
+    current_names = {r["name"] for r in current}
+    regressions = []
+    skipped = []
+    for base in baseline:
+        label = _label(base)
+        r = current_by_key.get(label)
+        if r is None:
+            if base["name"] in current_names:
+                skipped.append(f"{label}: not run with these parameters")
+            else:
+                regressions.append(f"{label}: in baseline but not run")
+            continue
+
+        now, before = _samples(r), _samples(base)
+        base_median = statistics.median(before)
+        if base_median <= 0:
+            continue
+        change = statistics.median(now) / base_median - 1
+        best_change = min(now) / min(before) - 1
+        if change > threshold and best_change > threshold and min(now) > max(before):
+            regressions.append(f"{label}: {change:+.1%} slower than baseline")
+    return regressions, skipped
+
+
+def main(argv: List[str] | None = None) -> int:
+    argv = argv if argv is not None else sys.argv[1:]
+    p = argparse.ArgumentParser(description="Benchmark the bot's hot paths offline")
+    p.add_argument("--out", "-o", default="logs/benchmark_results.json", help="Where to write the JSON results")
+    p.add_argument("--baseline", "-b", help="Previous results JSON to compare against")
+    p.add_argument("--threshold", "-t", type=float, default=0.15, help="Allowed slowdown vs baseline (0.15 = 15%%)")
+    p.add_argument("--repeat", type=int, default=5, help="Samples per benchmark (the median is reported)")
+    p.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per sample; short benchmarks are looped")
+    p.add_argument("--ops", type=int, default=200000, help="Calls per record_result / get_current_money run")
+    p.add_argument("--log-ops", type=int, default=20000, help="Rows written per log_bet run")
+    p.add_argument("--ticket-sizes", type=int, nargs="*", default=[1000, 10000, 100000, 1000000],
+                   help="Tickets log sizes (rows) for get_latest_tickets_iso_date")
+    p.add_argument("--ticket-calls", type=int, default=5, help="Calls per tickets log size")
+    p.add_argument("--csv-rows", type=int, default=2000000, help="Rows in the synthetic read_balance_trace CSV")
+    args = p.parse_args(argv)
+
+    results = run_all(args)
+    for r in results:
+        spread = (max(r["samples"]) - min(r["samples"])) / r["median"] if r["median"] else 0
+        print(f"{_label(r):<45} {r['median'] * 1e6:>12.3f} us/op  {r['ops_per_sec']:>14,.0f} ops/s  ±{spread:.1%}")
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as fh:
+        json.dump({
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, fh, indent=2)
+    print(f"Saved benchmark results to: {out_path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+        regressions, skipped = compare(results, baseline, args.threshold)
+        for msg in skipped:
+            print(f"Skipped {msg}")
+        if regressions:
+            print("Regressions:")
+            for msg in regressions:
+                print(f"  {msg}")
+            return 1
+        print(f"No regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
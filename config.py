@@ -40,6 +40,13 @@ class EnvConfig:
         self.strategy_name = os.environ.get("BET_STRATEGY", "paroli").lower()
         # base bet (can be integer or float in .env)
         self.base_bet = self._get_float("BASE_BET", 25)
+        # seconds to wait after a failed free coins claim before trying again
+        self.free_coins_cooldown = self._get_float("FREE_COINS_COOLDOWN", 30)
+        # game log backend: 'csv' (one FileLogger CSV per strategy) or 'sqlite'
+        # (shared SQLiteLedger database for every bot on the host)
+        self.log_backend = os.environ.get("LOG_BACKEND", "csv").lower()
+        self.ledger_db = path.join(self.project_root, os.environ.get("LEDGER_DB", path.join("logs", "ledger.db")))
+        self.bot_id = os.environ.get("BOT_ID") or f"{self.strategy_name}-{os.getpid()}"
 
     def _get_int(self, name: str, default: int):
         raw = os.environ.get(name)
@@ -59,6 +66,26 @@ class EnvConfig:
         except ValueError:
             return default
 
+    def get_logger(self, log_file: str):
+        """Return the game logger for the configured LOG_BACKEND.
+
+        log_file is the CSV path used by the default 'csv' backend.
+        """
+        if self.log_backend == "sqlite":
+            from ledger import SQLiteLedger
+
+            return SQLiteLedger(
+                self.ledger_db,
+                bot_id=self.bot_id,
+                strategy=self.strategy_name,
+                batch_size=self._get_int("LEDGER_BATCH_SIZE", 20),
+                flush_interval=self._get_float("LEDGER_FLUSH_INTERVAL", 5),
+            )
+
+        from logger import FileLogger
+
+        return FileLogger(log_file)
+
     def get_strategy(self, base_bet: float):
         """Return an instantiated strategy object configured from env vars.
 
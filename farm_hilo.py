@@ -1,18 +1,33 @@
+import signal
+import sys
 from os import path, environ, makedirs
-from time import sleep
+from time import sleep, monotonic
 from datetime import datetime
-from playwright.sync_api import sync_playwright
 from logger import FileLogger, get_latest_tickets_iso_date
 from config import EnvConfig
 from farm_ticktes import collect_tickets_routine
+from free_coins import FreeCoinsState
+from balance import current_money_span, get_current_money
+from waits import wait_ready, wait_stats, network_idle, element_enabled, balance_hydrated, balance_positive, all_ready
 
 free_coins_btn = ".valve-btn"
 hilo_value_input = ".app_input"
-current_money_span = ".free-coins"
 bet_red_btn = ".colorRed"
 countdown_timer_span = ".progress-bar__container"
 app_button = ".app_button"
 
+# readiness timeouts (ms), at most the fixed sleep each wait replaced
+landing_timeout = 2000
+free_coins_timeout = 2500
+hilo_timeout = 1000
+next_cycle_timeout = 1000
+# pause before reloading HiLo after play_hilo stopped on an error (ms)
+error_backoff = 5000
+# how often the wait report is printed and logged (seconds)
+wait_report_interval = 600
+# how long a claim may take to show up in the balance
+claim_refill_timeout = 3000
+
 # initialize logger (file will be created in the project folder)
 # Prepare logs directory and strategy-specific filename
 # Use a local logs/ folder inside the project (next to this file)
@@ -25,7 +40,8 @@ cfg = EnvConfig(project_root)
 strategy_name = cfg.strategy_name
 log_file = path.join(logs_dir, f"{strategy_name}_game_logs.csv")
 
-logger = FileLogger(log_file)
+# FileLogger CSV by default, SQLiteLedger when LOG_BACKEND=sqlite
+logger = cfg.get_logger(log_file)
 
 # Use configured base bet from env (falls back to 25 if not set)
 default_bet_amount = cfg.base_bet
@@ -33,12 +49,9 @@ default_bet_amount = cfg.base_bet
 # Instantiate the configured strategy (use default_bet as fallback)
 strategy = cfg.get_strategy(default_bet_amount)
 
+# Only go to /free-coins when a claim can actually succeed
+free_coins_state = FreeCoinsState(cooldown=cfg.free_coins_cooldown)
 
-def get_current_money(page):
-    page.wait_for_selector(current_money_span)
-    money_text = page.query_selector(current_money_span).inner_text()
-    money_value = float(money_text.replace(",", ".").replace(' ','').replace('\n',''))
-    return money_value
 
 def get_countdown_timer(page):
     countdown = page.query_selector(countdown_timer_span)
@@ -48,19 +61,37 @@ def get_countdown_timer(page):
     
 def collect_rewards(page):
     page.goto("https://csgofast.com/free-coins")
-    page.wait_for_timeout(2500)
+    wait_ready(
+        page, "collect_rewards",
+        all_ready(element_enabled(free_coins_btn), balance_hydrated(current_money_span)),
+        fixed_ms=2500, timeout_ms=free_coins_timeout,
+    )
     free_coins = page.wait_for_selector(free_coins_btn)
     free_coins.click()
 
+    try:
+        balance_positive(current_money_span)(page, claim_refill_timeout)
+    except Exception:
+        # still 0: the claim did not go through, record_claim starts the cooldown
+        pass
+    balance = get_current_money(page)
+    claimed = free_coins_state.record_claim(balance)
     # log that we attempted to collect free coins
-    logger.log_event("collect_rewards", details=f"clicked free coins; balance={get_current_money(page)}")
+    logger.log_event("collect_rewards", details=f"clicked free coins; claimed={claimed}; balance={balance}")
+    return claimed
 
 def load_hilo_page(page):
     page.goto("https://csgofast.com/free-coins/hilo")
     page.wait_for_selector(hilo_value_input)
 
 def play_hilo(page):
-    load_hilo_page(page)
+    """Bet until the balance reaches 0.
+
+    Returns True when the balance ran out, False if it stopped early on an
+    error (the caller should then reload HiLo before using the page again).
+    """
+    if page.url != "https://csgofast.com/free-coins/hilo":
+        load_hilo_page(page)
     hilo_input = page.query_selector(hilo_value_input)
     current_money = get_current_money(page)
     last_money = current_money
@@ -72,7 +103,11 @@ def play_hilo(page):
         if page.url != "https://csgofast.com/free-coins/hilo":
             load_hilo_page(page)
             hilo_input = page.query_selector(hilo_value_input)
-            page.wait_for_timeout(1000)
+            wait_ready(
+                page, "reload_hilo",
+                all_ready(element_enabled(hilo_value_input), balance_hydrated(current_money_span)),
+                fixed_ms=1000, timeout_ms=hilo_timeout,
+            )
          
         page.wait_for_selector(countdown_timer_span)
         # place the current bet
@@ -88,14 +123,14 @@ def play_hilo(page):
                         button.click()
                     except Exception as e:
                         print(f"Error clicking 'All' button: {e}")
-                        return
+                        return False
             
         else:
             try:
                 hilo_input.fill(str(placed_bet))
             except Exception as e:
                 print(f"Error filling hilo input: {e}")
-                return
+                return False
         red_btn = page.query_selector(bet_red_btn)
         red_btn.click()
 
@@ -127,22 +162,71 @@ def play_hilo(page):
         # set up for next round
         current_bet = next_bet
         last_money = current_money
+
+    return True
         
         
         
 
 
-with sync_playwright() as p:
-    browser = p.chromium.launch_persistent_context(
-        user_data_dir="my_profile",
-        headless=False,
-    )
-    page = browser.new_page()
-    page.goto("https://csgofast.com")
-    page.wait_for_timeout(2000)
-    page.wait_for_url("https://csgofast.com/free-coins")
-    
-    while True:
-        collect_rewards(page)
-        play_hilo(page)
-        page.wait_for_timeout(1000)
+def main():
+    # imported here so the helpers above can be used (e.g. by benchmark.py)
+    # without a browser install
+    from playwright.sync_api import sync_playwright
+
+    # turn SIGTERM into SystemExit so the finally below still runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch_persistent_context(
+                user_data_dir="my_profile",
+                headless=False,
+            )
+            page = browser.new_page()
+            page.goto("https://csgofast.com")
+            wait_ready(page, "landing", network_idle(), fixed_ms=2000, timeout_ms=landing_timeout)
+            page.wait_for_url("https://csgofast.com/free-coins")
+
+            finished = True
+            last_report = monotonic()
+            while True:
+                try:
+                    if not finished:
+                        # play_hilo stopped on an error: reload HiLo before
+                        # reading the balance from a possibly broken page
+                        load_hilo_page(page)
+                        finished = True
+                    balance = get_current_money(page)
+                except Exception as e:
+                    print(f"Error reading balance: {e}")
+                    finished = False
+                    page.wait_for_timeout(error_backoff)
+                    continue
+                free_coins_state.update_balance(balance)
+                if free_coins_state.can_claim():
+                    if not collect_rewards(page):
+                        continue
+                elif free_coins_state.state == FreeCoinsState.COOLDOWN:
+                    # nothing to bet and the claim can't succeed yet
+                    page.wait_for_timeout(free_coins_state.seconds_until_claim() * 1000)
+                    continue
+                finished = play_hilo(page)
+                if finished:
+                    # let the last round's requests settle before reading the balance
+                    wait_ready(page, "next_cycle", network_idle(), fixed_ms=1000, timeout_ms=next_cycle_timeout)
+                else:
+                    # don't hammer a broken page; it is reloaded on the next cycle
+                    page.wait_for_timeout(error_backoff)
+
+                if monotonic() - last_report >= wait_report_interval:
+                    report = wait_stats.report()
+                    print(f"Wait report: {report}")
+                    logger.log_event("wait_report", details=report)
+                    last_report = monotonic()
+    finally:
+        # write out any rows the ledger backend still has buffered
+        logger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 import os
 from datetime import datetime
 from logger import FileLogger, get_latest_tickets_iso_date
+from waits import wait_ready, element_visible
 
 collect_tickets_btn = '.get-pieces-btn'
+collect_tickets_timeout = 1000
 file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "farm_tickets_logs.csv")
 
 
 def collect_tickets(page):
     page.goto("https://csgofast.com/tickets")
-    page.wait_for_timeout(1000)
+    wait_ready(page, "collect_tickets", element_visible(collect_tickets_btn), fixed_ms=1000, timeout_ms=collect_tickets_timeout)
     try:
         page.wait_for_selector(collect_tickets_btn)
         collect_btn = page.query_selector(collect_tickets_btn)
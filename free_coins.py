@@ -0,0 +1,66 @@
+"""Free coins claim state machine.
+
+The 100 free coins can only be claimed when the balance is 0, so navigating to
+/free-coins while there is still money to bet is wasted time. FreeCoinsState
+tracks the last known balance and when the last failed claim was attempted,
+and tells the bot whether a claim can actually succeed:
+
+  - BETTING:   balance is positive (or unknown), stay on HiLo
+  - CLAIMABLE: balance is 0 and the cooldown since the last failed claim is over
+  - COOLDOWN:  balance is 0 but a claim failed less than `cooldown` seconds
+               ago, wait instead of reloading /free-coins
+
+A successful claim does not start the cooldown, so a bot that loses its
+coins quickly can claim again right away.
+"""
+from time import monotonic
+
+
+class FreeCoinsState:
+    BETTING = "betting"
+    CLAIMABLE = "claimable"
+    COOLDOWN = "cooldown"
+
+    def __init__(self, cooldown=30, clock=monotonic):
+        """cooldown: seconds to wait after a failed claim before trying again.
+        clock: time source in seconds (injectable for testing).
+        """
+        self.cooldown = float(cooldown)
+        self.clock = clock
+        self.balance = None
+        self.last_attempt = None
+
+    @property
+    def state(self):
+        if self.balance is None or self.balance > 0:
+            return self.BETTING
+        if self.seconds_until_claim() > 0:
+            return self.COOLDOWN
+        return self.CLAIMABLE
+
+    def update_balance(self, balance):
+        self.balance = balance
+        return self.state
+
+    def can_claim(self):
+        return self.state == self.CLAIMABLE
+
+    def seconds_until_claim(self):
+        """Seconds left on the claim cooldown (0 when a claim may be tried)."""
+        if self.last_attempt is None:
+            return 0
+        return max(0.0, self.cooldown - (self.clock() - self.last_attempt))
+
+    def record_claim(self, balance_after):
+        """Record a claim attempt and the balance read right after it.
+
+        Only a failed claim (balance still 0) starts the cooldown.
+        Returns True if the claim refilled the balance.
+        """
+        claimed = balance_after > 0
+        self.last_attempt = None if claimed else self.clock()
+        self.update_balance(balance_after)
+        return claimed
+
+
+__all__ = ["FreeCoinsState"]
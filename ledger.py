@@ -0,0 +1,383 @@
+"""SQLite ledger backend for game logs.
+
+An alternative to the per-strategy CSV files written by FileLogger: every bot
+on the host writes to one SQLite database in WAL mode, so many processes can
+append at the same time while others (e.g. plot_strategies.py) read.
+
+SQLiteLedger has the same API as FileLogger:
+  - log_bet(bet_value, result, balance_before, balance_after, timestamp)
+  - log_event(event_type, details, timestamp)
+Rows are tagged with bot_id and strategy and inserted in batches.
+Timestamps are UTC with an explicit offset (e.g. 2024-01-01T12:00:00.000000+00:00)
+for bets and events alike, so time ordering and joins work across bots.
+
+Usage:
+    python ledger.py import logs/*_game_logs.csv          # import existing CSVs into logs/ledger.db
+                                                           # (globs are expanded here, so PowerShell works too)
+    python ledger.py import --db other.db logs/martingale_game_logs.csv
+    python ledger.py summary                               # rows per strategy / bot
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import csv
+import glob
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import List
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "ledger.db")
+
+COLUMNS = [
+    "timestamp",
+    "bot_id",
+    "strategy",
+    "type",
+    "bet_value",
+    "result",
+    "balance_before",
+    "balance_after",
+    "details",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    bot_id TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    type TEXT NOT NULL,
+    bet_value REAL,
+    result TEXT,
+    balance_before REAL,
+    balance_after REAL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_bot_time ON ledger (bot_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_ledger_strategy_time ON ledger (strategy, timestamp);
+CREATE INDEX IF NOT EXISTS idx_ledger_time ON ledger (timestamp);
+"""
+
+# bot ids of imported CSV rows start with this; live bots may not use it, so
+# re-importing (which replaces rows of the same bot_id) never touches live rows
+IMPORT_PREFIX = "csv:"
+
+INSERT = f"INSERT INTO ledger ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+
+def connect(db_path: str = DEFAULT_DB, timeout: float = 30) -> sqlite3.Connection:
+    """Open the ledger database in WAL mode and make sure the schema exists.
+
+    timeout is how long a writer waits for another process's lock.
+    """
+    directory = os.path.dirname(os.path.abspath(db_path))
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # safe with WAL: a power loss can drop the last commits but not corrupt the db
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _utc_now() -> str:
+    # fixed precision so timestamps also sort correctly as text
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _to_utc(timestamp: str, naive_is_utc: bool) -> str:
+    """Normalise a FileLogger timestamp to the ledger's UTC format.
+
+    FileLogger writes naive timestamps: UTC for bets, local time for events.
+    Unparseable values are kept as they are.
+    """
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return timestamp or ""
+    if dt.tzinfo is None:
+        # astimezone() on a naive datetime treats it as local time
+        dt = dt.replace(tzinfo=timezone.utc) if naive_is_utc else dt.astimezone()
+    return dt.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _to_float(value):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SQLiteLedger:
+    """Drop-in replacement for FileLogger writing to a shared SQLite db.
+
+    Rows are buffered and written in one transaction as soon as batch_size
+    rows are pending, and by a background thread every flush_interval
+    seconds, so a row reaches the db at most flush_interval seconds after it
+    was logged. Pending rows are also flushed on close() and at interpreter
+    exit; a killed process (SIGKILL, os._exit) can lose at most the rows of
+    the last flush_interval.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB, bot_id: str = None, strategy: str = "",
+                 batch_size: int = 20, flush_interval: float = 5):
+        self.db_path = db_path
+        self.bot_id = bot_id or f"bot-{os.getpid()}"
+        if self.bot_id.startswith(IMPORT_PREFIX):
+            raise ValueError(f"bot_id {self.bot_id!r} is reserved for imported CSV logs ({IMPORT_PREFIX}*)")
+        self.strategy = strategy
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.lock = Lock()
+        self.pending = []
+        self.conn = connect(db_path)
+        self.stopped = Event()
+        self.flusher = Thread(target=self._flush_loop, name="ledger-flush", daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self):
+        while not self.stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                # rows stay pending and are retried on the next tick
+                print(f"Ledger flush failed: {e}")
+
+    def _write_row(self, row: dict):
+        with self.lock:
+            self.pending.append(tuple(row.get(col) for col in COLUMNS))
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if not self.pending or self.conn is None:
+            return
+        # IMMEDIATE takes the write lock up front so concurrent writers queue
+        # on busy_timeout instead of failing halfway through the batch
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(INSERT, self.pending)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.pending = []
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        self.stopped.set()
+        with self.lock:
+            if self.conn is None:
+                return
+            self._flush()
+            self.conn.close()
+            self.conn = None
+
+    def log_bet(self, bet_value, result, balance_before=None, balance_after=None, timestamp: str = None):
+        """Log a bet event.
+
+        result should be a short string like 'win' or 'loss'.
+        """
+        if timestamp is None:
+            timestamp = _utc_now()
+        self._write_row({
+            "timestamp": timestamp,
+            "bot_id": self.bot_id,
+            "strategy": self.strategy,
+            "type": "bet",
+            "bet_value": _to_float(bet_value),
+            "result": result,
+            "balance_before": _to_float(balance_before),
+            "balance_after": _to_float(balance_after),
+            "details": "",
+        })
+
+    def log_event(self, event_type: str, details: str = "", timestamp: str = None):
+        if timestamp is None:
+            timestamp = _utc_now()
+        self._write_row({
+            "timestamp": timestamp,
+            "bot_id": self.bot_id,
+            "strategy": self.strategy,
+            "type": event_type,
+            "bet_value": None,
+            "result": "",
+            "balance_before": None,
+            "balance_after": None,
+            "details": details,
+        })
+
+
+def import_csv(csv_path: str, db_path: str = DEFAULT_DB, strategy: str = None, bot_id: str = None) -> int:
+    """Import a FileLogger CSV into the ledger and return the number of rows.
+
+    strategy defaults to the file name (`<strategy>_game_logs.csv`) and bot_id
+    to `csv:<file name>`; a given bot_id is prefixed with `csv:` too, so the
+    rows can't be mixed up with a live bot's. Importing the same file (or
+    bot_id) again replaces the rows of that earlier import only.
+    Timestamps are converted to UTC (FileLogger bets are naive UTC, events
+    naive local time).
+    """
+    name = Path(csv_path).name
+    if strategy is None:
+        strategy = Path(csv_path).stem.replace("_game_logs", "")
+    if bot_id is None:
+        bot_id = name
+    if not bot_id.startswith(IMPORT_PREFIX):
+        bot_id = f"{IMPORT_PREFIX}{bot_id}"
+
+    with open(csv_path, "r", newline="", encoding="utf-8") as fh:
+        rows = [
+            (
+                _to_utc(row.get("timestamp"), naive_is_utc=row.get("type") == "bet"),
+                bot_id,
+                strategy,
+                row.get("type") or "",
+                _to_float(row.get("bet_value")),
+                row.get("result") or "",
+                _to_float(row.get("balance_before")),
+                _to_float(row.get("balance_after")),
+                row.get("details") or "",
+            )
+            for row in csv.DictReader(fh)
+        ]
+
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM ledger WHERE bot_id = ?", (bot_id,))
+            conn.executemany(INSERT, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def list_strategies(db_path: str = DEFAULT_DB) -> List[str]:
+    conn = connect(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT DISTINCT strategy FROM ledger ORDER BY strategy")]
+    finally:
+        conn.close()
+
+
+def list_bots(db_path: str = DEFAULT_DB, strategy: str = None) -> List[tuple]:
+    """Return the (strategy, bot_id) pairs that logged bets, optionally for one strategy."""
+    query = "SELECT DISTINCT strategy, bot_id FROM ledger WHERE type = 'bet'"
+    params = []
+    if strategy is not None:
+        query += " AND strategy = ?"
+        params.append(strategy)
+    query += " ORDER BY strategy, bot_id"
+
+    conn = connect(db_path)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+
+def balance_trace(db_path: str = DEFAULT_DB, strategy: str = None, bot_id: str = None) -> List[tuple]:
+    """Return (timestamp, balance_after) for every bet, oldest first.
+
+    Filter by strategy and/or bot_id; both use the ledger indexes. Without a
+    bot_id, rows of every bot are interleaved, so pass one to get a single
+    balance line.
+    """
+    query = "SELECT timestamp, balance_after FROM ledger WHERE type = 'bet' AND balance_after IS NOT NULL"
+    params = []
+    if strategy is not None:
+        query += " AND strategy = ?"
+        params.append(strategy)
+    if bot_id is not None:
+        query += " AND bot_id = ?"
+        params.append(bot_id)
+    query += " ORDER BY timestamp"
+
+    conn = connect(db_path)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+
+def summary(db_path: str = DEFAULT_DB) -> List[tuple]:
+    """Return (strategy, bot_id, bets, first timestamp, last timestamp) rows."""
+    conn = connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT strategy, bot_id, SUM(type = 'bet'), MIN(timestamp), MAX(timestamp) "
+            "FROM ledger GROUP BY strategy, bot_id ORDER BY strategy, bot_id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+__all__ = [
+    "SQLiteLedger",
+    "IMPORT_PREFIX",
+    "connect",
+    "import_csv",
+    "list_strategies",
+    "list_bots",
+    "balance_trace",
+    "summary",
+]
+
+
+def main(argv: List[str] | None = None) -> int:
+    argv = argv if argv is not None else sys.argv[1:]
+    p = argparse.ArgumentParser(description="SQLite ledger for game logs")
+    p.add_argument("--db", default=DEFAULT_DB, help="Ledger database path")
+    sub = p.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import FileLogger CSV files")
+    imp.add_argument("files", nargs="+", help="CSV log files or glob patterns to import")
+    imp.add_argument("--strategy", help="Strategy name (default: taken from the file name)")
+    imp.add_argument("--bot-id", help="Bot id, always prefixed with csv: (default: csv:<file name>)")
+    sub.add_parser("summary", help="Show rows per strategy and bot")
+    args = p.parse_args(argv)
+
+    if args.command == "import":
+        # expand globs ourselves: PowerShell passes `logs/*_game_logs.csv` through as is
+        files = []
+        for pattern in args.files:
+            matches = sorted(glob.glob(pattern))
+            if not matches and not glob.has_magic(pattern):
+                matches = [pattern]
+            if not matches:
+                print(f"No files match {pattern}")
+            files += matches
+        if args.bot_id and len(files) > 1:
+            # each import replaces the rows of its bot_id
+            p.error("--bot-id can only be used with a single file")
+        for fp in files:
+            count = import_csv(fp, args.db, strategy=args.strategy, bot_id=args.bot_id)
+            print(f"Imported {count} rows from {fp}")
+        return 0
+
+    for strategy, bot_id, bets, first, last in summary(args.db):
+        print(f"{strategy:<15} {bot_id:<30} {bets:>8} bets  {first} -> {last}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
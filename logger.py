@@ -43,6 +43,10 @@ class FileLogger:
                 writer = csv.DictWriter(fh, fieldnames=self.DEFAULT_FIELDS)
                 writer.writerow(row)
 
+    def close(self):
+        """Nothing to flush (every row is written right away); kept so
+        FileLogger and SQLiteLedger can be used interchangeably."""
+
     def log_bet(self, bet_value, result, balance_before=None, balance_after=None, timestamp: str = None):
         """Log a bet event.
 
@@ -75,12 +79,14 @@ class FileLogger:
         }
         self._write_row(row)
 
-def get_latest_tickets_iso_date() -> str:
+def get_latest_tickets_iso_date(file_path: str = None) -> str:
     """Return the timestamp of the latest tickets log entry.
 
+    file_path defaults to logs/farm_tickets_logs.csv next to this module.
     Returns None if no tickets log exists.
     """
-    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "farm_tickets_logs.csv")
+    if file_path is None:
+        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "farm_tickets_logs.csv")
     if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
         return None
 
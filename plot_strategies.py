@@ -2,11 +2,13 @@
 
 Reads any *_game_logs.csv files in the `logs/` directory (or files passed via
 --files) and plots the balance over time for each strategy on a single chart.
+With --db the traces are read from a SQLite ledger (see ledger.py) instead.
 
 Usage:
     python plot_strategies.py            # scans logs/ for *_game_logs.csv and saves a PNG
     python plot_strategies.py --show     # also shows the plot window
     python plot_strategies.py --out out.png --files logs/martingale_game_logs.csv
+    python plot_strategies.py --db logs/ledger.db   # one line per bot in the ledger
 
 The script saves the chart to `logs/strategies_comparison.png` by default.
 """
@@ -15,7 +17,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 import sys
-from typing import List
+from typing import Callable, List, Tuple
 
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -51,7 +53,38 @@ def read_balance_trace(path: Path) -> pd.DataFrame:
     return df[["timestamp", "balance"]] if "timestamp" in df.columns else df[["balance"]]
 
 
-def plot_traces(files: List[Path], out_path: Path, show: bool = False) -> None:
+def read_ledger_trace(db_path: Path, strategy: str, bot_id: str) -> pd.DataFrame:
+    from ledger import balance_trace
+
+    rows = balance_trace(str(db_path), strategy=strategy, bot_id=bot_id)
+    df = pd.DataFrame(rows, columns=["timestamp", "balance"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    df["balance"] = pd.to_numeric(df["balance"], errors="coerce")
+    return df.dropna(subset=["timestamp", "balance"])
+
+
+def ledger_sources(db_path: Path) -> List[Tuple[str, Callable[[], pd.DataFrame]]]:
+    """One line per bot, labelled `strategy/bot_id`."""
+    from ledger import list_bots
+
+    return [
+        (f"{strategy}/{bot_id}", lambda s=strategy, b=bot_id: read_ledger_trace(db_path, s, b))
+        for strategy, bot_id in list_bots(str(db_path))
+    ]
+
+
+def file_sources(files: List[Path]) -> List[Tuple[str, Callable[[], pd.DataFrame]]]:
+    return [
+        (path.stem.replace("_game_logs", ""), lambda p=path: read_balance_trace(p))
+        for path in files
+    ]
+
+
+def plot_traces(files: List[Path], out_path: Path, show: bool = False,
+                sources: List[Tuple[str, Callable[[], pd.DataFrame]]] | None = None) -> None:
+    """Plot one line per CSV in `files`, or per (label, loader) in `sources`."""
+    if sources is None:
+        sources = file_sources(files)
     # Try preferred styles in order and fall back to the first available one.
     preferred_styles = ["seaborn-darkgrid", "seaborn", "ggplot", "default"]
     for style in preferred_styles:
@@ -67,15 +100,13 @@ def plot_traces(files: List[Path], out_path: Path, show: bool = False) -> None:
     fig, ax = plt.subplots(figsize=(12, 6))
 
     plotted = 0
-    for path in files:
+    for label, load in sources:
         try:
-            df = read_balance_trace(path)
+            df = load()
         except Exception as exc:
-            print(f"Skipping {path}: read error: {exc}")
+            print(f"Skipping {label}: read error: {exc}")
             continue
 
-        label = path.stem.replace("_game_logs", "")
-
         if "timestamp" in df.columns:
             ax.plot(df["timestamp"], df["balance"], label=label)
         else:
@@ -84,7 +115,7 @@ def plot_traces(files: List[Path], out_path: Path, show: bool = False) -> None:
         plotted += 1
 
     if plotted == 0:
-        print("No valid traces plotted. Check that CSVs exist and have numeric balance columns.")
+        print("No valid traces plotted. Check that CSVs (or the ledger) exist and have numeric balance columns.")
         return
 
     ax.set_title("Strategy balance over time")
@@ -107,8 +138,17 @@ def main(argv: List[str] | None = None) -> int:
     p.add_argument("--files", "-f", nargs="*", help="Specific CSV log files to plot")
     p.add_argument("--out", "-o", default="logs/strategies_comparison.png", help="Output image path")
     p.add_argument("--show", action="store_true", help="Show the plot window after saving")
+    p.add_argument("--db", help="Read traces from a SQLite ledger instead of CSV files")
     args = p.parse_args(argv)
 
+    if args.db:
+        db_path = Path(args.db)
+        if not db_path.exists():
+            print(f"Ledger not found: {db_path}")
+            return 2
+        plot_traces([], Path(args.out), show=True, sources=ledger_sources(db_path))
+        return 0
+
     if args.files and len(args.files) > 0:
         files = [Path(fp) for fp in args.files]
     else:
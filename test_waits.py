@@ -0,0 +1,63 @@
+import time
+
+from waits import WaitStats, all_ready, wait_ready
+
+
+class FakePage:
+    """Stands in for a playwright Page; wait_for_timeout really sleeps."""
+
+    def wait_for_timeout(self, ms):
+        time.sleep(ms / 1000)
+
+
+def ready_after(seconds):
+    def ready(page, timeout_ms):
+        if seconds * 1000 > timeout_ms:
+            time.sleep(timeout_ms / 1000)
+            raise TimeoutError(f"timeout {timeout_ms}ms exceeded")
+        time.sleep(seconds)
+    return ready
+
+
+def never_ready(page, timeout_ms):
+    time.sleep(timeout_ms / 1000)
+    raise TimeoutError(f"timeout {timeout_ms}ms exceeded")
+
+
+def timed_wait(ready, fixed_ms):
+    stats = WaitStats()
+    start = time.perf_counter()
+    became_ready = wait_ready(FakePage(), "test", ready, fixed_ms=fixed_ms, stats=stats)
+    return became_ready, time.perf_counter() - start, stats
+
+
+def test_ready_page_moves_on_early():
+    became_ready, elapsed, stats = timed_wait(ready_after(0.05), fixed_ms=500)
+    assert became_ready
+    assert elapsed < 0.3
+    assert stats.saved_ms() > 0
+
+
+def test_fallback_never_exceeds_fixed_sleep():
+    became_ready, elapsed, _ = timed_wait(never_ready, fixed_ms=300)
+    assert not became_ready
+    assert elapsed < 0.3 + 0.1
+
+
+def test_all_ready_shares_one_deadline():
+    # first condition uses 90% of the budget, the second never becomes ready
+    became_ready, elapsed, stats = timed_wait(all_ready(ready_after(0.27), never_ready), fixed_ms=300)
+    assert not became_ready
+    assert elapsed < 0.3 + 0.1
+    assert stats.saved_ms() > -100
+
+
+def test_all_ready_stops_when_budget_is_spent():
+    calls = []
+
+    def second(page, timeout_ms):
+        calls.append(timeout_ms)
+
+    became_ready, elapsed, _ = timed_wait(all_ready(ready_after(0.3), second), fixed_ms=300)
+    assert not became_ready
+    assert calls == []
@@ -0,0 +1,152 @@
+"""Readiness-driven waits.
+
+Instead of sleeping a fixed number of milliseconds after a navigation, wait
+for the thing we actually need (network idle, an element being enabled, the
+balance widget showing a number). Every wait has its own timeout, capped at
+the fixed sleep it replaces: a ready page moves on early, and a page that is
+not ready in time has waited exactly as long as the old sleep.
+
+WaitStats keeps track of how long each wait took compared with the fixed sleep
+it replaced, so the idle time saved can be reported.
+
+Conditions are factories returning a callable(page, timeout_ms) that returns
+once the page is ready or raises (e.g. playwright's TimeoutError).
+"""
+from time import perf_counter
+
+
+def network_idle():
+    def ready(page, timeout_ms):
+        page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    return ready
+
+
+def element_visible(selector):
+    def ready(page, timeout_ms):
+        page.wait_for_selector(selector, state="visible", timeout=timeout_ms)
+    return ready
+
+
+def element_enabled(selector):
+    # not using the :enabled pseudo-class since some "buttons" are plain divs
+    def ready(page, timeout_ms):
+        page.wait_for_function(
+            """sel => {
+                const el = document.querySelector(sel);
+                return !!el && el.offsetParent !== null && !el.disabled
+                    && el.getAttribute('aria-disabled') !== 'true';
+            }""",
+            arg=selector,
+            timeout=timeout_ms,
+        )
+    return ready
+
+
+def balance_hydrated(selector):
+    """The balance widget exists and shows a number."""
+    def ready(page, timeout_ms):
+        page.wait_for_function(
+            "sel => { const el = document.querySelector(sel); return !!el && /\\d/.test(el.innerText); }",
+            arg=selector,
+            timeout=timeout_ms,
+        )
+    return ready
+
+
+def balance_positive(selector):
+    """The balance widget shows an amount above 0 (e.g. after a claim)."""
+    def ready(page, timeout_ms):
+        page.wait_for_function(
+            """sel => {
+                const el = document.querySelector(sel);
+                return !!el && parseFloat(el.innerText.replace(',', '.').replace(/\\s/g, '')) > 0;
+            }""",
+            arg=selector,
+            timeout=timeout_ms,
+        )
+    return ready
+
+
+def all_ready(*conditions):
+    """All conditions, checked in order against one shared deadline: each
+    condition only gets the part of timeout_ms the previous ones left."""
+    def ready(page, timeout_ms):
+        deadline = perf_counter() + timeout_ms / 1000
+        for condition in conditions:
+            remaining_ms = (deadline - perf_counter()) * 1000
+            # playwright treats timeout=0 as "no timeout", so stop here instead
+            if remaining_ms <= 0:
+                raise TimeoutError(f"timeout {timeout_ms}ms exceeded")
+            condition(page, remaining_ms)
+    return ready
+
+
+class WaitStats:
+    """Per-wait totals: how often it ran, how often it fell back to the fixed
+    sleep, and the time spent vs the fixed sleep it replaced (in ms)."""
+
+    def __init__(self):
+        self.waits = {}
+
+    def record(self, name, fixed_ms, waited_ms, fallback=False):
+        entry = self.waits.setdefault(name, {"count": 0, "fallbacks": 0, "fixed_ms": 0.0, "waited_ms": 0.0})
+        entry["count"] += 1
+        entry["fixed_ms"] += fixed_ms
+        entry["waited_ms"] += waited_ms
+        if fallback:
+            entry["fallbacks"] += 1
+
+    def saved_ms(self, name=None):
+        """Idle time saved (negative if the readiness waits were slower)."""
+        entries = [self.waits[name]] if name is not None else self.waits.values()
+        return sum(e["fixed_ms"] - e["waited_ms"] for e in entries)
+
+    def report(self):
+        parts = []
+        for name, e in self.waits.items():
+            parts.append(
+                f"{name}: n={e['count']} fallbacks={e['fallbacks']} "
+                f"saved={(e['fixed_ms'] - e['waited_ms']) / 1000:.1f}s"
+            )
+        parts.append(f"total saved={self.saved_ms() / 1000:.1f}s")
+        return "; ".join(parts)
+
+
+# shared by farm_hilo and farm_ticktes
+wait_stats = WaitStats()
+
+
+def wait_ready(page, name, ready, fixed_ms, timeout_ms=None, stats=wait_stats):
+    """Wait until `ready` passes instead of sleeping `fixed_ms`.
+
+    timeout_ms defaults to (and is capped at) fixed_ms. If the condition
+    fails early, sleep for whatever is left of fixed_ms, so a wait never
+    takes longer than the old fixed sleep.
+    Returns True if the page became ready, False if the fallback was used.
+    """
+    timeout_ms = fixed_ms if timeout_ms is None else min(timeout_ms, fixed_ms)
+    start = perf_counter()
+    fallback = False
+    try:
+        ready(page, timeout_ms)
+    except Exception as e:
+        remaining_ms = fixed_ms - (perf_counter() - start) * 1000
+        print(f"Wait '{name}' not ready after {timeout_ms}ms ({e})")
+        if remaining_ms > 0:
+            page.wait_for_timeout(remaining_ms)
+        fallback = True
+    stats.record(name, fixed_ms, (perf_counter() - start) * 1000, fallback=fallback)
+    return not fallback
+
+
+__all__ = [
+    "network_idle",
+    "element_visible",
+    "element_enabled",
+    "balance_hydrated",
+    "balance_positive",
+    "all_ready",
+    "WaitStats",
+    "wait_stats",
+    "wait_ready",
+]